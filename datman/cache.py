@@ -1,11 +1,18 @@
 from abc import abstractmethod
-from typing import Union
+from typing import Iterable, Set, Tuple, Union
 from pathlib import Path
+import atexit
+from collections import OrderedDict
+import importlib.util
+import pickle
+import pickletools
 from .kv_store import save_kv, load_kv
 
 class IOBackend:
+    # `save` returns the file it wrote (extension included); `load` takes that exact file.
+    # Backends returning None from `save` are resolved with `resolve`.
     @abstractmethod
-    def save(self, data: dict, path: Path) -> None:
+    def save(self, data: dict, path: Path) -> Union[Path, None]:
         raise NotImplementedError
     @abstractmethod
     def load(self, path: Path) -> dict:
@@ -13,65 +20,175 @@ class IOBackend:
     @abstractmethod
     def extension(self) -> str:
         raise NotImplementedError
+
+    def extensions(self) -> Tuple[str, ...]:
+        # every extension `save` may produce
+        return (self.extension(),)
+
+    def resolve(self, path: Path) -> Path:
+        # file written for `path` by `save`, for index entries stored without extension
+        return self._add_extension_if_missing(path)
     
-    def _add_extension_if_missing(self, path: Path) -> Path:
-        if not path.suffix == self.extension():
-            path = Path(f"{path}{self.extension()}")
+    def _add_extension_if_missing(self, path: Path, extension: Union[str, None] = None) -> Path:
+        extension = extension or self.extension()
+        if not path.suffix == extension:
+            path = Path(f"{path}{extension}")
         return path
 
 
+# parameter names of np.savez, which cannot be used as array names
+_SAVEZ_PARAMETERS = frozenset(("file", "args", "kwds", "allow_pickle"))
+
 class NumpyBackend(IOBackend):
     def __init__(self, allow_pickle: bool = True) -> None:
-        import numpy as np # type: ignore
-        self.np = np
+        self._np = None  # imported on first use
         
         self.allow_pickle = allow_pickle
 
-    def save(self, data: dict, path: Path) -> None:
-        self.np.save(self._add_extension_if_missing(path), data, allow_pickle=self.allow_pickle) # type: ignore
+    @property
+    def np(self):
+        if self._np is None:
+            import numpy as np # type: ignore
+            self._np = np
+        return self._np
+
+    def save(self, data: dict, path: Path) -> Path:
+        npz_path = self._add_extension_if_missing(path, ".npz")
+        npy_path = self._add_extension_if_missing(path, ".npy")
+        if all(isinstance(key, str) and key not in _SAVEZ_PARAMETERS and type(value) is self.np.ndarray
+               for key, value in data.items()):
+            # arrays are stored natively, without a pickle pass.
+            # keys become savez keyword arguments, so they must be strings not clashing with its parameters;
+            # ndarray subclasses (masked arrays, matrices) would come back as plain arrays, so they are pickled
+            self.np.savez(npz_path, **data)
+            npy_path.unlink(missing_ok=True)
+            return npz_path
+        else:
+            # mixed values: store the whole dict as a pickled 0-d object array
+            self.np.save(npy_path, data, allow_pickle=self.allow_pickle) # type: ignore
+            npz_path.unlink(missing_ok=True)
+            return npy_path
 
     def load(self, path: Path) -> dict:
-        return self.np.load(self._add_extension_if_missing(path), allow_pickle=self.allow_pickle).item()
+        if path.suffix == ".npz":
+            with self.np.load(path, allow_pickle=self.allow_pickle) as npz:
+                return {key: npz[key] for key in npz.files}
+        return self.np.load(path, allow_pickle=self.allow_pickle).item()
     def extension(self) -> str:
-        return ".npy"
+        return ".npz"
+
+    def extensions(self) -> Tuple[str, ...]:
+        return (".npz", ".npy")
+
+    def resolve(self, path: Path) -> Path:
+        npz_path = self._add_extension_if_missing(path, ".npz")
+        return npz_path if npz_path.exists() else self._add_extension_if_missing(path, ".npy")
     
 class TorchBackend(IOBackend):
     def __init__(self) -> None:
-        try:
-            import torch # type: ignore
-            self.torch = torch
-        except ImportError:
+        # importing torch takes seconds: only check that it is there, import it on first use
+        if importlib.util.find_spec("torch") is None:
             raise ImportError("PyTorch is not installed. Please install it to use the 'torch' backend.")
-        
+        self._torch = None
 
-    def save(self, data: dict, path: Path) -> None:
-        self.torch.save(data, self._add_extension_if_missing(path))
+    @property
+    def torch(self):
+        if self._torch is None:
+            import torch # type: ignore
+            self._torch = torch
+        return self._torch
+
+    def save(self, data: dict, path: Path) -> Path:
+        path = self._add_extension_if_missing(path)
+        self.torch.save(data, path)
+        return path
 
     def load(self, path: Path) -> dict:
-        return self.torch.load(self._add_extension_if_missing(path))
+        return self.torch.load(path)
     def extension(self) -> str:
         return ".pt"
 
+class PickleBackend(IOBackend):
+    def __init__(self, optimize: bool = True) -> None:
+        # pickletools.optimize drops unused memo entries, for smaller and faster to load files
+        self.optimize = optimize
+
+    def save(self, data: dict, path: Path) -> Path:
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.optimize:
+            payload = pickletools.optimize(payload)
+        path = self._add_extension_if_missing(path)
+        with open(path, "wb") as f:
+            f.write(payload)
+        return path
+
+    def load(self, path: Path) -> dict:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    def extension(self) -> str:
+        return ".pkl"
+
 class SimpleCache():
+    # Width in bytes of the memory-mapped index slots, which hold UTF-8 encoded file names;
+    # longer names (or negative/sparse positions) switch the cache to the kv index.
+    INDEX_WIDTH = 64
+    INDEX_DTYPE = f"S{INDEX_WIDTH}"
+    INDEX_MIN_SLOTS = 64
+
     def __init__(self,
                  root: Union[str, Path],
                  backend: IOBackend,
                  keep_in_memory: bool = True,
+                 flush_every: int = 0,
+                 max_cached: Union[int, None] = 128,
                  ):
         
         self.backend = backend
         self.root = Path(root)
         self.data_path = self.root / "data"
         self.index_path = self.root / "index.kv"
+        self.index_mm_path = self.root / "index.mm"
         self.keep_in_memory = keep_in_memory
-        self.cache = {}
+        # write the index every `flush_every` saves (0: after every save)
+        self.flush_every = flush_every
+        # samples kept in memory, least recently used first (None: no limit)
+        self.max_cached = max_cached
+        self.cache = OrderedDict()
+        # position -> file name in data_path (extension included)
         self.index = {}
 
         self.root.mkdir(parents=True, exist_ok=True)
         self.data_path.mkdir(parents=True, exist_ok=True)
 
+        # The index is stored as a memory-mapped array of fixed-width names (one slot per
+        # position) so that saving a sample only writes its own slot. Without numpy, or for
+        # caches created with the kv index, the whole index is rewritten as a kv file.
+        self._np = None
+        self._index_mm = None
+        self._pending = set()  # index positions not yet written to the memory-mapped index
+
         if self.index_path.exists():
             self.index = load_kv(self.index_path,True)
+        else:
+            try:
+                import numpy as np # type: ignore
+                self._np = np
+            except ImportError:
+                pass
+            if self._np is not None and self.index_mm_path.exists():
+                self._index_mm = self._np.memmap(self.index_mm_path, dtype=self.INDEX_DTYPE, mode="r+")
+                self.index = {int(i): self._index_mm[i].decode() for i in self._np.flatnonzero(self._index_mm != b"")}
+
+        # indexes written before file names were stored hold bare sample names
+        extensions = self.backend.extensions()
+        for position, name in self.index.items():
+            if Path(name).suffix not in extensions:
+                self.index[position] = self.backend.resolve(self.data_path / name).name
+                self._mark_pending(position)
+        # sample name -> position
+        self._positions = {}
+        for position, name in self.index.items():
+            self._register_name(name, position)
 
 
     def __len__(self) -> int:
@@ -83,37 +200,137 @@ class SimpleCache():
     def __setitem__(self, key: Union[str, int], data: dict) -> None:
         self.save(key, data)
 
+    def __enter__(self) -> "SimpleCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.save_index()
+
     
     def _save(self, key: Union[str, int], data: dict) -> None:
         if isinstance(key, int):
-            self.index[key] = f'sample_{key}'
+            position = key
+            name = f'sample_{key}'
         else:
-            self.index[len(self.index)] = key if isinstance(key, str) else str(key)
+            name = key if isinstance(key, str) else str(key)
+            position = self._positions.get(name, len(self.index))
 
-        data_path = self.data_path / f"{key}"
-        self.backend.save(data, data_path)
-        if self.keep_in_memory:
-            self.cache[key] = data
+        file_path = self.backend.save(data, self.data_path / name)
+        if file_path is None:
+            # custom backends written before save() returned the file
+            file_path = self.backend.resolve(self.data_path / name)
+        file_name = file_path.name
+        previous = self.index.get(position)
+        if previous != file_name:
+            if previous is not None:
+                self.cache.pop(previous, None)
+            self.index[position] = file_name
+            self._mark_pending(position)
+        self._positions[name] = position
+        self._register_name(file_name, position)
+        self._remember(file_name, data)
         
         
     def save(self, key: Union[str, int], data: dict) -> None:
         self._save(key, data)
         
+        if len(self._pending) >= max(self.flush_every, 1):
+            self.save_index()
+
+    def save_many(self, items: Iterable[Tuple[Union[str, int], dict]]) -> None:
+        for key, data in items:
+            self._save(key, data)
+
         self.save_index()
     
     def save_index(self) -> None:
-        save_kv(self.index_path, self.index)
+        if not self._pending:
+            return
+
+        if self._np is None:
+            save_kv(self.index_path, self.index)
+            self._mark_flushed()
+            return
+
+        # slots are addressed by position: negative or very sparse positions, and names
+        # that do not fit a slot, cannot be stored in the memory-mapped index
+        max_position = max(2 * len(self.index), 1024)
+        if any(i < 0 or i >= max_position or len(self.index[i].encode()) > self.INDEX_WIDTH for i in self._pending):
+            self._switch_to_kv_index()
+            return
+
+        size = max(self._pending) + 1
+        if self._index_mm is None or len(self._index_mm) < size:
+            self._grow_index_mm(size)
+        for i in self._pending:
+            self._index_mm[i] = self.index[i].encode()  # type: ignore[index]
+        self._index_mm.flush()  # type: ignore[union-attr]
+        self._mark_flushed()
+
+    def _register_name(self, file_name: str, position: int) -> None:
+        # Backends do not add their extension to names that already end with it, so a file
+        # name may or may not carry an extension added by the backend: register both.
+        self._positions[file_name] = position
+        suffix = Path(file_name).suffix
+        if suffix in self.backend.extensions():
+            self._positions[file_name[:-len(suffix)]] = position
+
+    def _mark_pending(self, position: int) -> None:
+        self._pending.add(position)
+        # keep the cache alive until its index is written, even if the caller drops it
+        _DIRTY_CACHES.add(self)
+
+    def _mark_flushed(self) -> None:
+        self._pending.clear()
+        _DIRTY_CACHES.discard(self)
+
+    def _grow_index_mm(self, size: int) -> None:
+        # grow geometrically so that appending samples only rarely remaps the file
+        capacity = 0 if self._index_mm is None else len(self._index_mm)
+        capacity = max(size, 2 * capacity, self.INDEX_MIN_SLOTS)
+        if self._index_mm is not None:
+            self._index_mm.flush()
+            self._index_mm = None
+        with open(self.index_mm_path, "ab") as f:
+            f.truncate(capacity * self._np.dtype(self.INDEX_DTYPE).itemsize)  # type: ignore[union-attr]
+        self._index_mm = self._np.memmap(self.index_mm_path, dtype=self.INDEX_DTYPE, mode="r+")  # type: ignore[union-attr]
+
+    def _switch_to_kv_index(self) -> None:
+        self._np = None
+        self._index_mm = None
+        self.save_index()
+        self.index_mm_path.unlink(missing_ok=True)
             
     def load(self, key: Union[str, int]) -> dict:
         if isinstance(key, int):
-            key = self.index[key]
+            file_name = self.index[key]
+        else:
+            file_name = self.index[self._positions[key]]
+
+        if file_name in self.cache:
+            self.cache.move_to_end(file_name)
+            return self.cache[file_name]
+
+        data = self.backend.load(self.data_path / file_name)
+
+        self._remember(file_name, data)
+        return data
+
+    def _remember(self, key: str, data: dict) -> None:
+        if not self.keep_in_memory:
+            return
+        self.cache[key] = data
+        self.cache.move_to_end(key)
+        if self.max_cached is not None:
+            while len(self.cache) > self.max_cached:
+                self.cache.popitem(last=False)
 
-        if key in self.cache:
-            return self.cache[key]
 
-        data_path = self.data_path / f"{key}"
-        data = self.backend.load(data_path)
+# Caches with unflushed index entries, flushed when the interpreter exits.
+# Strong references: a cache dropped before exit must not lose its pending entries.
+_DIRTY_CACHES: Set[SimpleCache] = set()
 
-        if self.keep_in_memory:
-            self.cache[key] = data
-        return data
\ No newline at end of file
+@atexit.register
+def _flush_dirty_caches() -> None:
+    for cache in list(_DIRTY_CACHES):
+        cache.save_index()
\ No newline at end of file
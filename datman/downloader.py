@@ -1,14 +1,50 @@
-from typing import Callable, Literal, Union
+from typing import Iterator, List, Literal, Tuple, Union
 import requests
 import hashlib
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from pathlib import Path
 import shutil
+import threading
 import zipfile
 import tarfile
+from contextlib import contextmanager
+
+try:
+    # optional: parallel gzip decompression for .tar.gz archives
+    import rapidgzip # type: ignore
+except ImportError:
+    rapidgzip = None
+
+try:
+    # optional: zip extraction in C, without per-member Python overhead (python-libarchive-c)
+    import libarchive # type: ignore
+    import libarchive.extract # type: ignore
+except (ImportError, OSError):  # OSError: bindings installed but the shared library is missing
+    libarchive = None
 
 SupportedArchives = Literal['zip','tar']
 
+CHUNK_SIZE = 1 << 20  # 1 MiB
+MMAP_CHUNK_SIZE = 16 << 20  # 16 MiB, also the minimum file size for mmap hashing
+# Leaf size of "<algo>-tree" digests. Part of the digest definition: changing it changes every tree digest.
+TREE_LEAF_SIZE = 16 << 20  # 16 MiB
+TREE_SUFFIX = "-tree"
+# Zip archives with at least this much uncompressed data are extracted concurrently
+# (by a process pool if requested, else by threads) rather than by libarchive
+PARALLEL_EXTRACT_MIN_SIZE = 64 << 20  # 64 MiB
+# Downloads of at least this size use parallel range requests when enabled and supported
+PARALLEL_DOWNLOAD_MIN_SIZE = 64 << 20  # 64 MiB
+
+# Progress bars redraw at most every PROGRESS_INTERVAL seconds; hot loops report every PROGRESS_STEP bytes
+PROGRESS_INTERVAL = 0.5
+PROGRESS_STEP = 8 << 20  # 8 MiB
+
+# Shared session, so that repeated requests reuse connections
+_SESSION = requests.Session()
+
 class Downloader:
 
     fodler : Path
@@ -19,6 +55,11 @@ class Downloader:
     data_path : Union[Path,None]
     archive_type : Union[SupportedArchives,None]
     skip_verify : bool
+    revalidate_existing : bool
+    connections : int
+    extract_processes : bool
+    legacy_file_path : Union[Path,None]
+    cas_path : Union[Path,None]
 
 
     def __init__(self,
@@ -29,12 +70,27 @@ class Downloader:
                  archive_type: Union[SupportedArchives, None] = None,
                  data_path: Union[str, Path, None] = None,
                  checksum: Union[str, None] = None,
-                 skip_verify: bool = False) -> None:
+                 skip_verify: bool = False,
+                 revalidate_existing: bool = False,
+                 connections: int = 1,
+                 extract_processes: bool = False,
+                 cas_folder: Union[str, Path, None] = None) -> None:
 
         self.folder = Path(folder)
         self.data_url = data_url
         self.file_path = self.folder / filename
+        self.legacy_file_path = None
+        self.cas_path = None
         self.checksum = checksum
+        if checksum:
+            # archives are keyed by content, so that versions sharing an archive share the file
+            algo, digest = parse_digest(checksum)
+            digest = digest.lower()
+            self.legacy_file_path = self.file_path
+            self.file_path = self.folder / f"{digest[:16]}_{filename}"
+            if cas_folder is not None:
+                # verified archives are also hard-linked into a content-addressed store
+                self.cas_path = Path(cas_folder) / f"{algo}_{digest}"
         self.extract_path = Path(extract_path)
         self.data_path = Path(data_path) if data_path is not None else None
         self.archive_type = archive_type
@@ -42,12 +98,23 @@ class Downloader:
         self.skip_verify = skip_verify
         if checksum is None:
             self.skip_verify = True
+        # an existing archive was already verified before being renamed into place,
+        # so by default we do not hash it again
+        self.revalidate_existing = revalidate_existing
+        # number of concurrent range requests for large downloads, if the server supports them
+        self.connections = connections
+        # extract large zip archives with a process pool instead of threads
+        self.extract_processes = extract_processes
 
     def download_and_extract(self) -> None:
         self.folder.mkdir(parents=True, exist_ok=True)
+        self._adopt_existing_archive()
 
         # Download zip if not present or checksum fails
-        verified = self.verify(self.file_path) if self.file_path.exists() else False
+        if self.file_path.exists():
+            verified = self.verify(self.file_path) if self.revalidate_existing else True
+        else:
+            verified = False
         if not self.file_path.exists() or not verified:
             if self.file_path.exists():
                 print("Existing file checksum does not match, re-downloading...")
@@ -55,10 +122,70 @@ class Downloader:
             download(
                 url=self.data_url,
                 file_path=self.file_path,
-                verify_checksum_func=self.verify
+                expected_digest=None if self.skip_verify else self.checksum,
+                connections=self.connections,
             )
+            self._store_in_cas()
         
         self.extract()
+
+    def link_extracted(self, source_extract_path: Union[str, Path]) -> bool:
+        """Hard-link the members of this archive from another extraction of the same archive.
+
+        Returns False, leaving the extraction to `download_and_extract`, if the archive or any
+        of the source files is missing, or if the files cannot be linked.
+        """
+        source_extract_path = Path(source_extract_path)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self._adopt_existing_archive()
+        if not self.file_path.exists():
+            return False
+
+        names = archive_members(self.file_path)
+        sources = [_member_target(source_extract_path, name) for name in names]
+        if not all(source.is_file() for source in sources):
+            return False
+        if source_extract_path.absolute() == self.extract_path.absolute():
+            # same place: the files are already there
+            return True
+
+        remover = self._remove_data_path()
+        try:
+            for name, source in zip(names, sources):
+                target = _member_target(self.extract_path, name)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.unlink(missing_ok=True)
+                os.link(source, target)
+        except OSError:
+            # e.g. different filesystems
+            return False
+        finally:
+            if remover is not None:
+                remover.join()
+        return True
+
+    def _adopt_existing_archive(self) -> None:
+        if self.file_path.exists():
+            return
+        if self.legacy_file_path is not None and self.legacy_file_path.exists() and self.verify(self.legacy_file_path):
+            # downloaded before archives were keyed by checksum
+            os.replace(self.legacy_file_path, self.file_path)
+            self._store_in_cas()
+        elif self.cas_path is not None and self.cas_path.exists():
+            try:
+                os.link(self.cas_path, self.file_path)
+            except OSError:
+                pass  # e.g. different filesystems: download it again
+
+    def _store_in_cas(self) -> None:
+        # only verified archives go into the store
+        if self.cas_path is None or self.skip_verify or self.cas_path.exists():
+            return
+        self.cas_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(self.file_path, self.cas_path)
+        except OSError:
+            pass
     
     def verify(self, file_path : Path) -> bool:
         return verify_checksum(file_path, self.checksum, self.skip_verify)
@@ -69,15 +196,31 @@ class Downloader:
             # we check this before deleting anything
             raise RuntimeError(f"Cannot extract, file {self.file_path} does not exist.")
 
-        if self.data_path and self.data_path.exists():
-            # if we decided to extract, it means we want a fresh copy.
-            # to avoid issues, we delete any existing data folder
-            print(f"Removing existing data folder {self.data_path}...")
-            shutil.rmtree(self.data_path)
+        # if we decided to extract, it means we want a fresh copy.
+        # to avoid issues, we delete any existing data folder.
+        remover = self._remove_data_path()
 
         self.extract_path.mkdir(parents=True, exist_ok=True)
 
-        extract(self.file_path, self.extract_path)
+        try:
+            extract(self.file_path, self.extract_path, use_processes=self.extract_processes)
+        finally:
+            if remover is not None:
+                remover.join()
+
+    def _remove_data_path(self) -> Union[threading.Thread, None]:
+        # The folder is moved out of the way and deleted in the background, the caller joins the thread.
+        if not (self.data_path and self.data_path.exists()):
+            return None
+        print(f"Removing existing data folder {self.data_path}...")
+        trash_path = self.data_path.with_name(f"{self.data_path.name}.trash")
+        if trash_path.exists():
+            # left over by an interrupted run
+            shutil.rmtree(trash_path)
+        os.rename(self.data_path, trash_path)
+        remover = threading.Thread(target=shutil.rmtree, args=(trash_path,))
+        remover.start()
+        return remover
     
 ################# Helper functions #################
 
@@ -89,91 +232,470 @@ def verify_checksum(file_path : Union[str, Path], expected_digest: Union[str, No
     if not expected_digest:
         return True
 
-    # expected_digest may be like "sha256:abcd..." or just the digest (default to sha256)
-    if ":" in expected_digest:
-        algo, digest = expected_digest.split(":", 1)
-        algo = algo.lower()
-    else:
-        algo = "sha256"
-        digest = expected_digest
+    algo, digest = parse_digest(expected_digest)
 
     # compute actual digest using requested algorithm
-    actual = checksum(file_path, algorithm=algo)
+    # "sha256-tree:..." digests are computed over fixed-size leaves, in parallel
+    if algo.endswith(TREE_SUFFIX):
+        actual = checksum_parallel(file_path, algorithm=algo[:-len(TREE_SUFFIX)])
+    else:
+        actual = checksum(file_path, algorithm=algo)
     # normalize and compare
     return actual.lower() == digest.lower()
 
+def parse_digest(expected_digest: str) -> Tuple[str, str]:
+    # expected_digest may be like "sha256:abcd..." or just the digest (default to sha256)
+    if ":" in expected_digest:
+        algo, digest = expected_digest.split(":", 1)
+        return algo.lower(), digest
+    return "sha256", expected_digest
+
 def checksum(file_path: Union[str, Path], algorithm : str = "sha256") -> str:
     file_path = Path(file_path)
-    # support common algorithms
-    alg = algorithm.lower()
-    if alg not in hashlib.algorithms_available and alg not in {"md5","sha1","sha256","sha512"}:
-        # fallback to hashlib attribute if available, else raise
+    hasher = _new_hasher(algorithm)
+    size = file_path.stat().st_size
+
+    with open(file_path, "rb") as f, tqdm(
+        total=size, unit='B', unit_scale=True, mininterval=PROGRESS_INTERVAL, desc="Verifying checksum"
+    ) as pbar:
+        if size >= MMAP_CHUNK_SIZE and _checksum_mmap(f, hasher, pbar):
+            return hasher.hexdigest()
+
+        reader = _ProgressReader(f, pbar)
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: the read/update loop runs with a large preallocated buffer
+            hasher = hashlib.file_digest(reader, lambda: hasher)  # type: ignore[attr-defined]
+        else:
+            for chunk in iter(lambda: reader.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _checksum_mmap(f, hasher, pbar: tqdm) -> bool:
+    # Feed the page cache straight into the hasher, without copying into bytes objects.
+    # Returns False if the file cannot be mapped (e.g. huge files on 32-bit/Windows),
+    # in which case nothing has been hashed yet and the caller falls back to read().
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError, OverflowError):
+        return False
+
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    with mm, memoryview(mm) as mv:
+        for offset in range(0, len(mv), MMAP_CHUNK_SIZE):
+            chunk = mv[offset:offset + MMAP_CHUNK_SIZE]
+            hasher.update(chunk)
+            pbar.update(len(chunk))
+            chunk.release()
+    return True
+
+def checksum_parallel(file_path: Union[str, Path], algorithm: str = "sha256", workers: Union[int, None] = None) -> str:
+    """Tree digest of a file: the hash of the concatenated digests of its TREE_LEAF_SIZE leaves.
+
+    Leaves are hashed concurrently (hashlib releases the GIL), so the result does not depend on `workers`.
+    Expected digests for this scheme are written as "<algorithm>-tree:<hexdigest>".
+    """
+    file_path = Path(file_path)
+    _new_hasher(algorithm)  # fail early on unsupported algorithms
+    size = file_path.stat().st_size
+    offsets = range(0, size, TREE_LEAF_SIZE)
+
+    with open(file_path, "rb") as f, tqdm(
+        total=size, unit='B', unit_scale=True, mininterval=PROGRESS_INTERVAL, desc="Verifying checksum"
+    ) as pbar:
         try:
-            hash_func = getattr(hashlib, alg)
-        except AttributeError:
-            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
-    else:
-        # prefer direct constructor if present
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except (OSError, ValueError, OverflowError):
+            mm = None
+
+        if mm is not None:
+            mv = memoryview(mm)
+
+            def hash_leaf(offset: int) -> bytes:
+                with mv[offset:offset + TREE_LEAF_SIZE] as leaf:
+                    return _leaf_digest(leaf, algorithm)
+        else:
+            def hash_leaf(offset: int) -> bytes:
+                # each worker needs its own file handle to seek independently
+                with open(file_path, "rb") as leaf_f:
+                    leaf_f.seek(offset)
+                    return _leaf_digest(leaf_f.read(TREE_LEAF_SIZE), algorithm)
+
+        hasher = _new_hasher(algorithm)
         try:
-            hash_func = getattr(hashlib, alg)
-        except AttributeError:
-            # fallback to new algorithm via hashlib.new
-            def hash_func():
-                return hashlib.new(alg)
-
-    # create hasher
-    hasher = hash_func() if callable(hash_func) else hashlib.new(alg)
-    with open(file_path, "rb") as f:
-        for chunk in tqdm(iter(lambda: f.read(8192), b""),
-                          total=round(file_path.stat().st_size / 8192),
-                          desc="Verifying checksum"):
-            hasher.update(chunk)
+            # the pool is shut down (and every leaf released) before the mapping is closed
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                for offset, digest in zip(offsets, pool.map(hash_leaf, offsets)):
+                    hasher.update(digest)
+                    pbar.update(min(TREE_LEAF_SIZE, size - offset))
+        finally:
+            if mm is not None:
+                mv.release()
+                mm.close()
     return hasher.hexdigest()
 
-def download(url: str, file_path: Union[str, Path], verify_checksum_func: Callable) -> None:
+def _leaf_digest(data, algorithm: str) -> bytes:
+    hasher = _new_hasher(algorithm)
+    hasher.update(data)
+    return hasher.digest()
+
+def _new_hasher(algorithm: str):
+    alg = algorithm.lower()
+    # prefer direct constructor if present, else fall back to hashlib.new
+    hash_func = getattr(hashlib, alg, None)
+    if callable(hash_func):
+        return hash_func()
+    try:
+        return hashlib.new(alg)
+    except ValueError:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+
+class _TreeHasher:
+    """Incremental version of checksum_parallel(), for data that arrives as a stream."""
+
+    def __init__(self, algorithm: str) -> None:
+        self.algorithm = algorithm
+        self.leaves: List[bytes] = []
+        self.leaf = _new_hasher(algorithm)
+        self.leaf_size = 0
+
+    def update(self, data) -> None:
+        view = memoryview(data)
+        while view:
+            n = min(len(view), TREE_LEAF_SIZE - self.leaf_size)
+            self.leaf.update(view[:n])
+            self.leaf_size += n
+            view = view[n:]
+            if self.leaf_size == TREE_LEAF_SIZE:
+                self.leaves.append(self.leaf.digest())
+                self.leaf = _new_hasher(self.algorithm)
+                self.leaf_size = 0
+
+    def leaf_digests(self) -> List[bytes]:
+        return self.leaves + [self.leaf.digest()] if self.leaf_size else self.leaves
+
+    def hexdigest(self) -> str:
+        root = _new_hasher(self.algorithm)
+        for digest in self.leaf_digests():
+            root.update(digest)
+        return root.hexdigest()
+
+class _ProgressReader:
+    """Minimal binary reader that reports the bytes read to a tqdm bar."""
+
+    def __init__(self, f, pbar: tqdm) -> None:
+        self.f = f
+        self.pbar = pbar
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self.f.readinto(buffer)
+        if n:
+            self.pbar.update(n)
+        return n
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.f.read(size)
+        if chunk:
+            self.pbar.update(len(chunk))
+        return chunk
+
+def download(url: str, file_path: Union[str, Path], expected_digest: Union[str, None] = None, connections: int = 1) -> None:
     file_path = Path(file_path)
     tmp_path = file_path.with_suffix(".zip.part")  # Temporary download file
 
+    algo = None
+    if expected_digest:
+        algo, digest = parse_digest(expected_digest)
+    tree_algo = algo[:-len(TREE_SUFFIX)] if algo and algo.endswith(TREE_SUFFIX) else None
+
     print(f"Downloading {url} ...")
-    response = requests.get(url, stream=True)
-    total_size = int(response.headers.get('content-length', 0))
-    chunk_size = 1024
+    ranged_size = _ranged_size(url) if connections > 1 else None
+    ranged = ranged_size is not None and ranged_size >= PARALLEL_DOWNLOAD_MIN_SIZE
+    if ranged:
+        try:
+            actual = parallel_download(url, tmp_path, ranged_size, connections, tree_algorithm=tree_algo)
+        except (RuntimeError, requests.RequestException) as e:
+            # e.g. the server advertises ranges but answers them with the whole file
+            print(f"Parallel download failed ({e}), retrying with a single connection...")
+            ranged = False
+        else:
+            if algo and not tree_algo:
+                # ranges arrive out of order, plain digests need a second pass
+                actual = checksum(tmp_path, algorithm=algo)
+    if not ranged:
+        # Hash while writing, so the file does not have to be read back for verification
+        hasher = None
+        if algo:
+            hasher = _TreeHasher(tree_algo) if tree_algo else _new_hasher(algo)
 
-    with open(tmp_path, "wb") as f, tqdm(
-        total=total_size, unit='B', unit_scale=True, desc="Downloading"
-    ) as pbar:
-        for chunk in response.iter_content(chunk_size=chunk_size):
-            if chunk:
-                f.write(chunk)
-                pbar.update(len(chunk))
+        with _SESSION.get(url, stream=True, headers={"Accept-Encoding": "identity"}) as response:
+            response.raise_for_status()
+            total_size = int(response.headers.get('content-length', 0))
+
+            with open(tmp_path, "wb") as f, tqdm(
+                total=total_size, unit='B', unit_scale=True, mininterval=PROGRESS_INTERVAL, desc="Downloading"
+            ) as pbar:
+                _preallocate(f, total_size)
+                progress = 0
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+                        progress += len(chunk)
+                        if progress >= PROGRESS_STEP:
+                            pbar.update(progress)
+                            progress = 0
+                pbar.update(progress)
+                # drop any preallocated space the server did not fill
+                f.truncate()
+        actual = hasher.hexdigest() if hasher is not None else None
 
     # Verify checksum before renaming
-    if verify_checksum_func and not verify_checksum_func(tmp_path):
+    if algo and (actual is None or actual.lower() != digest.lower()):
         tmp_path.unlink()  # remove incomplete/invalid download
         raise RuntimeError("Downloaded file checksum does not match! Try downloading again. If the problem persists, set skip_verify=True at your own risk.")
 
-    tmp_path.rename(file_path)  # rename only after successful download
+    os.replace(tmp_path, file_path)  # rename only after successful download
+
+def parallel_download(url: str, file_path: Union[str, Path], total_size: int, connections: int = 8,
+                      tree_algorithm: Union[str, None] = None) -> Union[str, None]:
+    """Download `url` with concurrent HTTP range requests into `file_path`.
 
-def extract(file_path: Union[str, Path], extract_path: Union[str, Path], archive_type : Union[Literal['zip','tar'], None] = None ) -> None:
+    The server must support byte ranges (see _ranged_size). Ranges are aligned to TREE_LEAF_SIZE,
+    so when `tree_algorithm` is given the "<algorithm>-tree" digest is computed on the fly and returned.
+    """
+    file_path = Path(file_path)
+    leaves_per_range = max(1, -(-total_size // (TREE_LEAF_SIZE * connections)))
+    range_size = leaves_per_range * TREE_LEAF_SIZE
+    offsets = range(0, total_size, range_size)
+
+    with open(file_path, "wb") as f:
+        _preallocate(f, total_size)
+        f.truncate(total_size)
+
+    # set when a range fails, so that the other workers stop downloading
+    failed = threading.Event()
+
+    with tqdm(total=total_size, unit='B', unit_scale=True, mininterval=PROGRESS_INTERVAL, desc="Downloading") as pbar:
+        def fetch(offset: int) -> List[bytes]:
+            end = min(offset + range_size, total_size) - 1
+            hasher = _TreeHasher(tree_algorithm) if tree_algorithm else None
+            headers = {"Range": f"bytes={offset}-{end}", "Accept-Encoding": "identity"}
+            # every worker writes its own range through its own file handle
+            with _SESSION.get(url, stream=True, headers=headers) as response, open(file_path, "r+b") as f:
+                if response.status_code != 206:
+                    raise RuntimeError(f"Server did not honour range request for {url} (status {response.status_code}).")
+                f.seek(offset)
+                progress = 0
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    if failed.is_set():
+                        return []
+                    if chunk:
+                        f.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+                        progress += len(chunk)
+                        if progress >= PROGRESS_STEP:
+                            pbar.update(progress)
+                            progress = 0
+                pbar.update(progress)
+                if f.tell() != end + 1:
+                    raise RuntimeError(f"Incomplete range {offset}-{end} downloaded from {url}.")
+            return hasher.leaf_digests() if hasher is not None else []
+
+        try:
+            with ThreadPoolExecutor(max_workers=connections) as pool:
+                futures = [pool.submit(fetch, offset) for offset in offsets]
+                try:
+                    range_leaves = [future.result() for future in futures]
+                except BaseException:
+                    failed.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+        except BaseException:
+            file_path.unlink(missing_ok=True)
+            raise
+
+    if tree_algorithm is None:
+        return None
+    root = _new_hasher(tree_algorithm)
+    for leaves in range_leaves:
+        for digest in leaves:
+            root.update(digest)
+    return root.hexdigest()
+
+def _preallocate(f, size: int) -> None:
+    # reserve the blocks up front: fewer extent allocations and less fragmentation
+    if size > 0 and hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError:
+            pass  # not supported by this filesystem
+
+def _ranged_size(url: str) -> Union[int, None]:
+    # size of the resource if the server accepts byte range requests, else None
+    response = _SESSION.head(url, allow_redirects=True, headers={"Accept-Encoding": "identity"})
+    if not response.ok or response.headers.get("Accept-Ranges", "").lower() != "bytes":
+        return None
+    size = int(response.headers.get("content-length", 0))
+    return size or None
+
+def extract(file_path: Union[str, Path], extract_path: Union[str, Path], archive_type : Union[Literal['zip','tar'], None] = None, workers: Union[int, None] = None, use_processes: bool = False) -> None:
     file_path = Path(file_path)
     if archive_type is None:
         # detect from file extension
         archive_type = detect_archive_type(file_path)
 
+    workers = workers or os.cpu_count() or 1
 
     if archive_type == 'zip':
         with zipfile.ZipFile(file_path, "r") as zip_ref:
-            file_list = zip_ref.namelist()
-            for file in tqdm(file_list, desc="Extracting", disable=False):
-                zip_ref.extract(file, extract_path)
+            infos = zip_ref.infolist()
+            concurrent = workers > 1 and len(infos) > 1
+            large = concurrent and sum(i.file_size for i in infos) >= PARALLEL_EXTRACT_MIN_SIZE
+            # Process pools are opt-in: they need a __main__ guard under spawn/forkserver,
+            # and forking while other threads run can deadlock.
+            parallel = large and use_processes
+            fast = not large and libarchive is not None
+            if not parallel and not fast:
+                if concurrent:
+                    _extract_zip_threaded(file_path, infos, extract_path, workers)
+                else:
+                    for info in tqdm(infos, desc="Extracting", disable=False, mininterval=PROGRESS_INTERVAL):
+                        zip_ref.extract(info, extract_path)
+        if parallel:
+            # ZipFile objects cannot be shared across processes, every worker opens its own
+            _extract_zip_parallel(file_path, [i.filename for i in infos], extract_path, workers)
+        elif fast:
+            _extract_zip_fast(file_path, extract_path, total=len(infos))
     elif archive_type == 'tar':
-        with tarfile.open(file_path, "r:*") as tar_ref:
+        with _open_tar(file_path) as tar_ref:
             file_list = tar_ref.getmembers()
-            for member in tqdm(file_list, desc="Extracting", disable=False):
+            for member in tqdm(file_list, desc="Extracting", disable=False, mininterval=PROGRESS_INTERVAL):
                 tar_ref.extract(member, extract_path)
     else:
         raise ValueError(f"Archive of type '{archive_type}' is not supported.")
 
+def _extract_zip_parallel(file_path: Path, names: List[str], extract_path: Union[str, Path], workers: int) -> None:
+    # Deflate is CPU bound: spread the members over processes, in contiguous batches so that
+    # files of the same directory mostly end up in the same worker.
+    batch_size = max(1, len(names) // (workers * 4))
+    batches = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool, tqdm(total=len(names), desc="Extracting", mininterval=PROGRESS_INTERVAL) as pbar:
+        futures = [pool.submit(_extract_zip_members, file_path, batch, extract_path) for batch in batches]
+        for future in as_completed(futures):
+            pbar.update(future.result())
+
+def _extract_zip_threaded(file_path: Path, infos: List[zipfile.ZipInfo], extract_path: Union[str, Path], workers: int) -> None:
+    # Archives of many small members are dominated by per-member overhead rather than by zlib:
+    # extract them concurrently (zlib releases the GIL). Every thread opens its own ZipFile,
+    # sharing one is not thread safe before Python 3.9. Directories are created up front,
+    # so workers only write files.
+    extract_path = Path(extract_path).absolute()
+    directories = set()
+    members = []
+    for info in infos:
+        target = _member_target(extract_path, info.filename)
+        if info.is_dir():
+            directories.add(target)
+        else:
+            directories.add(target.parent)
+            members.append((info, target))
+    for directory in sorted(directories):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    local = threading.local()
+    opened: List[zipfile.ZipFile] = []
+
+    def extract_member(member: Tuple[zipfile.ZipInfo, Path]) -> None:
+        info, target = member
+        zip_ref = getattr(local, "zip_ref", None)
+        if zip_ref is None:
+            zip_ref = local.zip_ref = zipfile.ZipFile(file_path, "r")
+            opened.append(zip_ref)
+        with zip_ref.open(info) as src, open(target, "wb") as dst:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(32, workers * 4)) as pool, \
+                tqdm(total=len(infos), desc="Extracting", mininterval=PROGRESS_INTERVAL) as pbar:
+            pbar.update(len(infos) - len(members))  # directories are done already
+            for _ in pool.map(extract_member, members):
+                pbar.update(1)
+    finally:
+        for zip_ref in opened:
+            zip_ref.close()
+
+def _member_target(extract_path: Path, name: str) -> Path:
+    # same sanitization as ZipFile.extract(): drop drive letters, absolute roots, "." and ".."
+    name = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        name = name.replace(os.path.altsep, os.path.sep)
+    name = os.path.splitdrive(name)[1]
+    parts = [part for part in name.split(os.path.sep) if part not in ("", os.path.curdir, os.path.pardir)]
+    return extract_path.joinpath(*parts)
+
+def _extract_zip_fast(file_path: Path, extract_path: Union[str, Path], total: int) -> None:
+    # libarchive writes entries relative to the working directory, which is process-wide state:
+    # point every entry at its absolute target instead, sanitized like ZipFile.extract() does,
+    # so "../x" and "/abs/x" members land inside extract_path rather than being rejected.
+    flags = libarchive.extract.EXTRACT_SECURE_NODOTDOT | libarchive.extract.EXTRACT_SECURE_SYMLINKS
+    extract_path = Path(extract_path).absolute()
+    extract_path.mkdir(parents=True, exist_ok=True)
+    with libarchive.file_reader(str(file_path)) as archive, tqdm(total=total, desc="Extracting", mininterval=PROGRESS_INTERVAL) as pbar:
+        def entries():
+            for entry in archive:
+                target = _member_target(extract_path, entry.pathname)
+                if target != extract_path:
+                    entry.pathname = str(target)
+                    yield entry
+                pbar.update(1)
+        libarchive.extract.extract_entries(entries(), flags)
+
+def _extract_zip_members(file_path: Path, names: List[str], extract_path: Union[str, Path]) -> int:
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        for name in names:
+            try:
+                zip_ref.extract(name, extract_path)
+            except FileExistsError:
+                # another worker created the same parent directory concurrently
+                zip_ref.extract(name, extract_path)
+    return len(names)
+
+@contextmanager
+def _open_tar(file_path: Path) -> Iterator[tarfile.TarFile]:
+    if rapidgzip is not None:
+        with open(file_path, "rb") as f:
+            is_gzip = f.read(2) == b"\x1f\x8b"
+        if is_gzip:
+            with rapidgzip.open(str(file_path), parallelization=os.cpu_count()) as fileobj, \
+                    tarfile.open(fileobj=fileobj, mode="r:") as tar_ref:
+                yield tar_ref
+            return
+    with tarfile.open(file_path, "r:*") as tar_ref:
+        yield tar_ref
+
+def archive_members(file_path: Union[str, Path], archive_type : Union[SupportedArchives, None] = None) -> List[str]:
+    # names of the regular files in the archive
+    file_path = Path(file_path)
+    if archive_type is None:
+        archive_type = detect_archive_type(file_path)
+
+    if archive_type == 'zip':
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            return [info.filename for info in zip_ref.infolist() if not info.is_dir()]
+    elif archive_type == 'tar':
+        with _open_tar(file_path) as tar_ref:
+            return [member.name for member in tar_ref.getmembers() if member.isfile()]
+    else:
+        raise ValueError(f"Archive of type '{archive_type}' is not supported.")
+
 def detect_archive_type(file_path: Union[str, Path]) -> SupportedArchives:
     file_path = Path(file_path)
     suffixes = file_path.suffixes
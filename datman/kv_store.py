@@ -1,18 +1,24 @@
 ##### Utility functions for key-value file handling
+import json
 from pathlib import Path
 from typing import Union
 
+try:
+    # optional: C-backed JSON, files are then stored as a JSON object instead of "key:value" lines
+    import orjson # type: ignore
+except ImportError:
+    orjson = None
+
 def load_kv(file_path : Union[str,Path], int_key: bool = False) -> dict:
-    data = {}
     try:
-        with open(file_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    key, value = line.split(":", 1)
-                    if int_key:
-                        key = int(key)
-                    data[key] = value
+        raw = Path(file_path).read_bytes()
+        data = _parse_json(raw)
+        if data is None:
+            # files written in the "key:value" format are migrated by the next save_kv
+            data = _parse_kv(raw.decode(), int_key)
+        elif int_key:
+            # JSON keys are always strings, so integer keys are cast back explicitly
+            data = {int(key): value for key, value in data.items()}
     except Exception as e:
         raise RuntimeError(f"Error reading key-value file {file_path}: {e}")
 
@@ -20,6 +26,27 @@ def load_kv(file_path : Union[str,Path], int_key: bool = False) -> dict:
 
 
 def save_kv(file_path : Union[str,Path], data : dict) -> None:
+    if orjson is not None:
+        Path(file_path).write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        return
+
     with open(file_path, "w") as f:
-        for key, value in data.items():
-            f.write(f"{key}:{value}\n")
\ No newline at end of file
+        f.write("".join(f"{key}:{value}\n" for key, value in data.items()))
+
+
+def _parse_kv(text: str, int_key: bool) -> dict:
+    pairs = (line.split(":", 1) for line in map(str.strip, text.splitlines()) if line)
+    if int_key:
+        return {int(key): value for key, value in pairs}
+    return dict(pairs)
+
+
+def _parse_json(raw: bytes) -> Union[dict, None]:
+    # a "key:value" file may start with "{" too: it is JSON only if it all parses as an object
+    if raw.lstrip()[:1] != b"{":
+        return None
+    try:
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
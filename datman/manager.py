@@ -1,5 +1,6 @@
-from typing import Callable, List, Union
+from typing import Callable, Dict, List, Set, Tuple, Union
 import enum
+import os
 from pathlib import Path
 
 from .downloader import Downloader
@@ -10,6 +11,8 @@ class Status(enum.Enum):
     NONE = "NONE"
     OK = "OK"
 
+_STATUS_BY_VALUE = {status.value: status for status in Status}
+
 
 class DataManager:
 
@@ -19,6 +22,15 @@ class DataManager:
     data_path : Path
     status_file_path : Path
     patches : list
+    checksum : Union[str,None]
+    extract_subpath : Path
+    from_scratch : bool
+
+    # STATUS files parsed so far, shared by all managers: path -> (file signature, statuses).
+    # Managers sharing a root reuse the parsed dict until the file changes on disk.
+    _STATUS_CACHE : Dict[Path, Tuple[Union[Tuple[int, int], None], Dict[str, str]]] = {}
+    # STATUS files with changes not yet written to disk, see flush_statuses()
+    _DIRTY_STATUS_FILES : Set[Path] = set()
 
     def __init__(
         self,
@@ -30,15 +42,20 @@ class DataManager:
         from_scratch: bool = False,
         patches : List[Callable[[str], None]] = [],
         skip_verify: bool = False,
+        revalidate: bool = False,
+        extract_processes: bool = False,
     ):
 
         self.dataset_id = dataset_id
         self.root = Path(root)
         self.patches = patches
+        self.checksum = remote.checksum
+        self.extract_subpath = Path(extract_subpath)
+        self.from_scratch = from_scratch
 
         extract_path = self.root / extract_subpath
         self.data_path = extract_path / remote.root_folder
-        self.status_file_path = self.root / "STATUS"
+        self.status_file_path = (self.root / "STATUS").resolve()
 
         if not self.root.exists():
             self.root.mkdir(parents=True, exist_ok=False)
@@ -46,6 +63,7 @@ class DataManager:
         self.write_readme()
 
         if from_scratch:
+            # written through immediately: the invalidation must be on disk before data is touched
             self.set_status(Status.NONE)
 
 
@@ -59,22 +77,32 @@ class DataManager:
             extract_path=extract_path,
             data_path=self.data_path,
             skip_verify=skip_verify,
+            # re-hash an already downloaded archive only when asked to or when starting from scratch
+            revalidate_existing=revalidate or from_scratch,
+            cas_folder=self.root / "CAS",
+            extract_processes=extract_processes,
         )
 
         self._download_and_extract()
 
-    
+        self.flush_statuses()
+
 
     def _download_and_extract(self) -> None:
         status = self.get_status()
         if status == Status.OK:
             return
-        
-        self.dv.download_and_extract()
-        
-        self._apply_patches()
 
-        self.set_status(Status.OK)
+        # another unpatched version extracted from the same archive can be reused as is
+        source = None if self.patches or self.from_scratch else self._find_extraction()
+        if source is not None and self.dv.link_extracted(source):
+            print(f"Reusing data extracted in {source}")
+        else:
+            self.dv.download_and_extract()
+
+            self._apply_patches()
+
+        self.set_status(Status.OK, flush=False)
 
         print(f"Dataset version {self.dataset_id} is ready")
 
@@ -93,45 +121,95 @@ class DataManager:
     ######## Status management ########
 
     def get_status(self) -> Status:
-        if not self.status_file_path.exists():
-            return Status.NONE
-
-        try:
-            statuses = load_kv(self.status_file_path)
-        except Exception as _:
-            print("Corrupted status file. Deleting it.")
-            self.status_file_path.unlink(missing_ok=True)
-            return Status.NONE
-        status_str = statuses.get(self.dataset_id, "NONE")
-        try:
-            return Status(status_str)
-        except ValueError:
+        statuses = self._load_statuses()
+        status_str = statuses.get(self.dataset_id, Status.NONE.value)
+        # OK entries may carry "<checksum> <extract subpath>" after the status, see _status_value()
+        status = _STATUS_BY_VALUE.get(status_str.split(" ", 1)[0])
+        if status is None:
             print(f"Unknown status '{status_str}' in status file. Treating as NONE.")
             return Status.NONE
+        return status
+
+    def set_status(self, status: Status, flush: bool = True) -> None:
+        statuses = self._load_statuses()
+        value = self._status_value(status)
+        if statuses.get(self.dataset_id, Status.NONE.value) == value:
+            # nothing changed, no need to touch the file
+            return
+        statuses[self.dataset_id] = value
+        DataManager._DIRTY_STATUS_FILES.add(self.status_file_path)
+        if flush:
+            self.flush_statuses()
+
+    def _status_value(self, status: Status) -> str:
+        # Unpatched extractions also record the archive checksum and where it was extracted,
+        # so that other versions using the same archive can reuse the files.
+        if status == Status.OK and self.checksum and not self.patches:
+            return f"{status.value} {self.checksum} {self.extract_subpath.as_posix()}"
+        return status.value
+
+    def _find_extraction(self) -> Union[Path, None]:
+        if not self.checksum:
+            return None
+        for dataset_id, value in self._load_statuses().items():
+            parts = value.split(" ", 2)
+            if dataset_id != self.dataset_id and len(parts) == 3 and parts[0] == Status.OK.value and parts[1] == self.checksum:
+                return self.root / parts[2]
+        return None
+
+    @classmethod
+    def flush_statuses(cls) -> None:
+        """Write every pending status change to disk."""
+        for path in list(cls._DIRTY_STATUS_FILES):
+            _, statuses = cls._STATUS_CACHE[path]
+            # write to a temporary file and swap it in, so readers never see a partial file
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            save_kv(tmp_path, statuses)
+            os.replace(tmp_path, path)
+            cls._STATUS_CACHE[path] = (_file_signature(path), statuses)
+            cls._DIRTY_STATUS_FILES.discard(path)
+
+    def _load_statuses(self) -> Dict[str, str]:
+        path = self.status_file_path
+        signature = _file_signature(path)
+        cached = DataManager._STATUS_CACHE.get(path)
+        if cached is not None and (path in DataManager._DIRTY_STATUS_FILES or cached[0] == signature):
+            return cached[1]
 
-    def set_status(self, status: Status) -> None:
         statuses = {}
-        if self.status_file_path.exists():
+        if signature is not None:
             try:
-                statuses = load_kv(self.status_file_path)
+                statuses = load_kv(path)
             except Exception as _:
-                print("Corrupted status file. Creating a new one.")
-        
-        statuses[self.dataset_id] = status.value
-        save_kv(self.status_file_path, statuses)
+                print("Corrupted status file. Deleting it.")
+                path.unlink(missing_ok=True)
+                signature = None
+        DataManager._STATUS_CACHE[path] = (signature, statuses)
+        return statuses
 
     def write_readme(self) -> None:
         with open(self.root / "README", "w") as f:
             f.write(README)
 
+def _file_signature(path: Path) -> Union[Tuple[int, int], None]:
+    # cheap change detection for cached files: (mtime, size), or None if missing
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 ##### README to insert into root folder #####
 
 README = """TLDR: DO NOT TOUCH the contents of this folder unless you know what you are doing.
 
 This folder is managed by a dataset data manager, which handles downloading, verifying and extracting files.
 If something does not work as expected, try to use `from_scratch=True` option or delete the `STATUS` file to force re-download and re-extraction.
+Archives already present are not verified again unless `revalidate=True` or `from_scratch=True` is used.
 
 If you want to free up space, you can delete the zip files after a *successful* extraction, they will be re-downloaded automatically if needed.
+Downloaded archives are named after their checksum and hard-linked into the `CAS` folder, delete them from there as well to actually free the space.
+Versions extracted from the same archive share their files through hard links.
 
 You can delete the extracted data folders for versions you do not need anymore, but they have to be deleted from the STATUS file as well.
 Be careful that some versions might be required by others as base data."""
@@ -0,0 +1,40 @@
+import zipfile
+
+from datman import downloader
+
+
+def _make_zip(path, n_members):
+    contents = {f"dir{i % 10}/file_{i}.txt": (f"{i}-" * (i % 200 + 1)).encode() for i in range(n_members)}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for name, data in contents.items():
+            zip_ref.writestr(name, data)
+    return contents
+
+
+def test_threaded_zip_extraction_many_members(tmp_path, monkeypatch):
+    # regression: sharing one ZipFile across threads corrupts reads on Python 3.8
+    monkeypatch.setattr(downloader, "libarchive", None)
+    archive = tmp_path / "many.zip"
+    contents = _make_zip(archive, 5000)
+
+    for attempt in range(3):
+        out = tmp_path / f"out{attempt}"
+        downloader.extract(archive, out, workers=4)
+        for name, data in contents.items():
+            assert (out / name).read_bytes() == data
+
+
+def test_zip_extraction_sanitizes_member_paths(tmp_path):
+    archive = tmp_path / "unsafe.zip"
+    with zipfile.ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("../../escaped.txt", "a")
+        zip_ref.writestr("/absolute/file.txt", "b")
+        zip_ref.writestr("dir/file.txt", "c")
+    out = tmp_path / "data" / "out"
+
+    downloader.extract(archive, out, workers=1)
+
+    assert (out / "escaped.txt").read_text() == "a"
+    assert (out / "absolute" / "file.txt").read_text() == "b"
+    assert (out / "dir" / "file.txt").read_text() == "c"
+    assert not (tmp_path / "escaped.txt").exists()